@@ -1,12 +1,28 @@
-from enum import Enum
-from typing import Dict, Optional
+import sys
+from collections import defaultdict, deque
+from enum import IntEnum
+from typing import Any, Deque, Dict, Final, Iterable, List, NamedTuple, Optional, Protocol, Tuple
 
 
-class SeatStatus(Enum):
-    """Перечисление возможных статусов места на мероприятии."""
-    FREE = "свободно"
-    RESERVED = "забронировано"
-    SOLD = "продано"
+# Статусы места хранятся как обычные int: проверка статуса — самая частая операция
+# в командах, и сравнение int обходится без диспетчеризации Enum.
+FREE: Final = 0
+RESERVED: Final = 1
+SOLD: Final = 2
+
+# Отображаемые названия статусов, индексируются кодом статуса.
+_STATUS_VALUES: Final[Tuple[str, ...]] = ("свободно", "забронировано", "продано")
+
+
+class SeatStatus(IntEnum):
+    """Перечисление возможных статусов места на мероприятии.
+
+    Члены равны кодам FREE, RESERVED и SOLD, которыми оперируют команды,
+    поэтому их можно сравнивать с `Seat.status` и использовать как индекс `_STATUS_VALUES`.
+    """
+    FREE = FREE
+    RESERVED = RESERVED
+    SOLD = SOLD
 
 
 class User:
@@ -17,17 +33,21 @@ class User:
         name (str): Имя пользователя (для отображения).
     """
 
-    def __init__(self, user_id: str, name: str):
+    __slots__ = ("user_id", "name")
+
+    def __init__(self, user_id: str, name: str) -> None:
         """Инициализирует пользователя.
 
         Args:
-            user_id: Уникальный ID (например, из базы данных).
+            user_id: Уникальный ID (например, из базы данных). Только str: ID интернируется,
+                и `sys.intern` отвергает другие типы; числовые ключи переводите через `str()`.
             name: Полное или отображаемое имя.
         """
-        self.user_id = user_id
-        self.name = name
+        # Ключ индекса EventSession.seats_by_user, поэтому интернируется, как и seat_id
+        self.user_id: str = sys.intern(user_id)
+        self.name: str = name
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"Польз({self.user_id}, {self.name})"
 
 
@@ -38,59 +58,150 @@ class Seat:
         seat_id (str): Уникальный идентификатор места (например, 'A1').
         row (str): Обозначение ряда (например, 'A', 'B').
         number (int): Номер места в ряду.
-        status (SeatStatus): Текущий статус места (свободно, забронировано, продано).
+        status (int): Текущий статус места: FREE, RESERVED или SOLD (свободно, забронировано, продано).
+            Только для чтения: меняется командами через EventSession.
         current_user (Optional[User]): Пользователь, связанный с местом (если забронировано или куплено).
+            Только для чтения, как и `status`.
     """
 
-    def __init__(self, seat_id: str, row: str, number: int):
+    __slots__ = ("seat_id", "row", "number", "_status", "_current_user", "_repr_cache")
+
+    def __init__(self, seat_id: str, row: str, number: int) -> None:
         """Инициализирует место.
 
         Args:
-            seat_id: Уникальный ID места.
+            seat_id: Уникальный ID места. Только str, как и `User.user_id`.
             row: Буквенное обозначение ряда.
             number: Номер места в ряду.
         """
-        self.seat_id = seat_id
-        self.row = row
-        self.number = number
-        self.status = SeatStatus.FREE
-        self.current_user: Optional[User] = None
+        # ID интернируются: ключи словарей-индексов сравниваются по указателю
+        self.seat_id: str = sys.intern(seat_id)
+        self.row: str = row
+        self.number: int = number
+        self._status: int = FREE
+        self._current_user: Optional[User] = None
+        self._repr_cache: Optional[str] = None
+
+    # Снаружи состояние доступно только через свойства; код этого модуля на горячих путях
+    # читает поля _status и _current_user напрямую, без вызова свойства.
+    @property
+    def status(self) -> int:
+        """Текущий статус места."""
+        return self._status
+
+    @property
+    def current_user(self) -> Optional[User]:
+        """Пользователь, связанный с местом, или None."""
+        return self._current_user
+
+    def _transition(self, new_status: int, new_user: Optional[User]) -> None:
+        """Меняет статус и владельца места и сбрасывает закешированную часть представления.
+
+        Args:
+            new_status: Новый статус места.
+            new_user: Новый пользователь или None.
+        """
+        self._status = new_status
+        self._current_user = new_user
+        self._repr_cache = None
 
-    def __repr__(self):
-        return f"Seat({self.seat_id}, {self.row}{self.number}, {self.status.value}, user={self.current_user})"
+    def __repr__(self) -> str:
+        # Кешируется только часть, принадлежащая месту: пользователь может быть переименован,
+        # поэтому форматируется при каждом вызове.
+        prefix = self._repr_cache
+        if prefix is None:
+            prefix = self._repr_cache = f"Seat({self.seat_id}, {self.row}{self.number}, {_STATUS_VALUES[self._status]}, user="
+        return f"{prefix}{self._current_user})"
 
 
 class EventSession:
     """Представляет одну сессию (сеанс) мероприятия с набором мест.
 
+    Статус и владелец хранятся только в объектах Seat; сессия дополнительно ведёт
+    счётчик свободных мест и индекс мест по пользователю.
+
     Attributes:
         session_id (str): Уникальный идентификатор сессии.
         time (str): Время проведения (в любом удобном формате, например ISO 8601).
         seats (Dict[str, Seat]): Карта мест, индексированных по seat_id.
+        seats_by_user (Dict[str, Dict[str, None]]): Обратный индекс: user_id -> ID мест,
+            связанных с пользователем, в порядке привязки (словарь как упорядоченное множество).
+        free_count (int): Число свободных мест; обновляется при каждом переходе.
     """
 
-    def __init__(self, session_id: str, time: str):
+    __slots__ = (
+        "session_id",
+        "time",
+        "seats",
+        "seats_by_user",
+        "free_count",
+    )
+
+    def __init__(self, session_id: str, time: str) -> None:
         """Инициализирует сессию мероприятия.
 
         Args:
             session_id: Уникальный ID сессии.
             time: Время проведения (например, '2026-02-01T19:00').
         """
-        self.session_id = session_id
-        self.time = time
+        self.session_id: str = session_id
+        self.time: str = time
         self.seats: Dict[str, Seat] = {}
+        self.seats_by_user: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self.free_count: int = 0
 
-    def add_seat(self, seat: Seat):
+    def add_seat(self, seat: Seat) -> None:
         """Добавляет место в сессию.
 
         Args:
             seat: Объект Seat для добавления.
         """
+        replaced = self.seats.get(seat.seat_id)
+        if replaced is not None:
+            self.free_count -= replaced._status == FREE
+            if replaced._current_user is not None:
+                self._unindex_seat(replaced._current_user, replaced.seat_id)
         self.seats[seat.seat_id] = seat
+        self.free_count += seat._status == FREE
+        if seat._current_user is not None:
+            self.seats_by_user[seat._current_user.user_id][seat.seat_id] = None
+
+    def add_seats(self, seats: Iterable[Seat]) -> None:
+        """Добавляет в сессию сразу много мест.
+
+        Словарь мест строится одним включением, а счётчик и индекс обновляются только
+        для занятых мест, поэтому загрузка нового зала почти не дороже заполнения
+        голого словаря. Места с повторяющимися ID добавляются через `add_seat`.
+
+        Args:
+            seats: Объекты Seat для добавления.
+        """
+        new_seats = list(seats)
+        by_id = {seat.seat_id: seat for seat in new_seats}
+        if len(by_id) != len(new_seats) or not self.seats.keys().isdisjoint(by_id.keys()):
+            # Повторяющиеся ID заменяют существующие места — это делает add_seat
+            for seat in new_seats:
+                self.add_seat(seat)
+            return
+
+        if self.seats:
+            self.seats.update(by_id)
+        else:
+            self.seats = by_id
+        # Новые места обычно свободны и ни к кому не привязаны: их не нужно перебирать в Python
+        taken = [seat for seat in new_seats if seat._status != FREE or seat._current_user is not None]
+        self.free_count += len(new_seats) - sum(seat._status != FREE for seat in taken)
+        for seat in taken:
+            if seat._current_user is not None:
+                self.seats_by_user[seat._current_user.user_id][seat.seat_id] = None
 
     def get_seat(self, seat_id: str) -> Optional[Seat]:
         """Возвращает место по его ID.
 
+        Ключи `seats` интернированы, поэтому поиск по ID, пришедшему извне (разбор запроса,
+        чтение из файла), быстрее, если вызывающая сторона сама передаёт его через `sys.intern`:
+        тогда ключи совпадают по указателю без сравнения строк. Метод ID не интернирует.
+
         Args:
             seat_id: Идентификатор места.
 
@@ -99,15 +210,103 @@ class EventSession:
         """
         return self.seats.get(seat_id)
 
-    def __repr__(self):
+    def count_free(self) -> int:
+        """Возвращает количество свободных мест в сессии.
+
+        Returns:
+            Число мест в статусе FREE.
+        """
+        return self.free_count
+
+    def any_free_seat(self) -> Optional[Seat]:
+        """Возвращает любое свободное место сессии.
+
+        Если по счётчику `free_count` свободных мест нет, места не перебираются.
+
+        Returns:
+            Первое по порядку добавления свободное место или None, если свободных нет.
+        """
+        if not self.free_count:
+            return None
+        return next((seat for seat in self.seats.values() if seat._status == FREE), None)
+
+    def _transition(self, seat: Seat, new_status: int, new_user: Optional[User]) -> None:
+        """Переводит место в новое состояние, поддерживая счётчик `free_count` и индекс `seats_by_user`.
+
+        Все изменения статуса и владельца места командами должны проходить через этот метод.
+
+        Args:
+            seat: Место, принадлежащее этой сессии.
+            new_status: Новый статус места.
+            new_user: Новый пользователь или None, чтобы отвязать место.
+        """
+        self.free_count += (new_status == FREE) - (seat._status == FREE)
+
+        old_user = seat._current_user
+        seat._transition(new_status, new_user)
+        if old_user is new_user:
+            return
+        if old_user is not None:
+            self._unindex_seat(old_user, seat.seat_id)
+        if new_user is not None:
+            self.seats_by_user[new_user.user_id][seat.seat_id] = None
+
+    def _unindex_seat(self, user: User, seat_id: str) -> None:
+        """Убирает место пользователя из индекса `seats_by_user`.
+
+        Пустой словарь пользователя остаётся в индексе: пользователь, отменивший бронь,
+        скорее всего забронирует снова, и пересоздавать словарь на каждой отмене незачем.
+
+        Args:
+            user: Пользователь, к которому было привязано место.
+            seat_id: Идентификатор места.
+        """
+        user_seats = self.seats_by_user.get(user.user_id)
+        if user_seats is not None:
+            user_seats.pop(seat_id, None)
+
+    def swap_state(self, a: Seat, b: Seat) -> None:
+        """Меняет местами статус и владельца двух мест сессии.
+
+        Используется для переноса брони: обмен со свободным местом переносит состояние
+        без проверок статуса, а повторный обмен тех же мест отменяет перенос.
+        Число свободных мест при обмене не меняется.
+
+        Args:
+            a: Первое место этой сессии.
+            b: Второе место этой сессии.
+        """
+        if a is b:
+            return
+        a_status, a_user = a._status, a._current_user
+        b_status, b_user = b._status, b._current_user
+        a._transition(b_status, b_user)
+        b._transition(a_status, a_user)
+
+        if a_user is b_user:
+            return
+        if a_user is not None:
+            user_seats = self.seats_by_user[a_user.user_id]
+            del user_seats[a.seat_id]
+            user_seats[b.seat_id] = None
+        if b_user is not None:
+            user_seats = self.seats_by_user[b_user.user_id]
+            del user_seats[b.seat_id]
+            user_seats[a.seat_id] = None
+
+    def __repr__(self) -> str:
         return f"EventSession({self.session_id}, {self.time}, seats={len(self.seats)})"
 
 
-class BookingCommand:
-    """Абстрактный интерфейс команды для операций с бронированием.
+class BookingCommand(Protocol):
+    """Интерфейс команды для операций с бронированием.
 
-    Каждая команда должна реализовывать логику выполнения (`execute`) и отмены (`undo`).
+    Каждая команда должна реализовывать логику выполнения (`execute`) и отмены
+    над уже найденным местом (`undo_on_seat`); `undo` находит место по ID и делегирует ему.
     Все изменения состояния системы должны происходить только через эти методы.
+
+    Интерфейс структурный (`Protocol`): наследоваться от него нужно только ради
+    реализаций `execute_with_memento` и `undo` по умолчанию.
     """
 
     def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
@@ -123,6 +322,23 @@ class BookingCommand:
         """
         raise NotImplementedError
 
+    def execute_with_memento(self, session: EventSession, seat_id: str, user: User) -> Tuple[bool, Any]:
+        """Выполняет операцию и возвращает данные для её отмены (мементо).
+
+        Мементо хранит вызывающая сторона (например, история `BookingProcessor`),
+        а не сама команда, поэтому один экземпляр команды можно безопасно
+        выполнять из нескольких потоков. Команды без состояния возвращают None.
+
+        Args:
+            session: Сессия мероприятия.
+            seat_id: Идентификатор места.
+            user: Пользователь, инициирующий операцию.
+
+        Returns:
+            Пара (успех, мементо).
+        """
+        return self.execute(session, seat_id, user), None
+
     def undo(self, session: EventSession, seat_id: str, user: User) -> bool:
         """Отменяет ранее выполненную операцию.
 
@@ -131,6 +347,26 @@ class BookingCommand:
             seat_id: Идентификатор места.
             user: Пользователь, чья операция отменяется.
 
+        Returns:
+            True, если отмена успешна; False в противном случае.
+        """
+        seat = session.seats.get(seat_id)
+        if not seat:
+            return False
+        return self.undo_on_seat(session, seat, user)
+
+    def undo_on_seat(self, session: EventSession, seat: Seat, user: User, memento: Any = None) -> bool:
+        """Отменяет ранее выполненную операцию над уже найденным местом.
+
+        Используется историей `BookingProcessor`, которая хранит команду вместе
+        с найденным местом, чтобы при отмене не искать место повторно.
+
+        Args:
+            session: Сессия мероприятия, которой принадлежит место.
+            seat: Место, над которым выполнялась операция.
+            user: Пользователь, чья операция отменяется.
+            memento: Данные для отмены из `execute_with_memento`, если команда их возвращает.
+
         Returns:
             True, если отмена успешна; False в противном случае.
         """
@@ -142,22 +378,22 @@ class ReserveSeat(BookingCommand):
 
     Место должно быть в статусе FREE. После бронирования переходит в RESERVED,
     и к нему привязывается пользователь.
+
+    Команда не хранит состояния: используйте готовый экземпляр-синглтон
+    вместо создания нового на каждую операцию.
     """
 
     def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
-        seat = session.get_seat(seat_id)
-        if not seat or seat.status != SeatStatus.FREE:
+        seat = session.seats.get(seat_id)
+        if not seat or seat._status != FREE:
             return False
-        seat.status = SeatStatus.RESERVED
-        seat.current_user = user
+        session._transition(seat, RESERVED, user)
         return True
 
-    def undo(self, session: EventSession, seat_id: str, user: User) -> bool:
-        seat = session.get_seat(seat_id)
-        if not seat or seat.status != SeatStatus.RESERVED or seat.current_user != user:
+    def undo_on_seat(self, session: EventSession, seat: Seat, user: User, memento: Any = None) -> bool:
+        if seat._status != RESERVED or seat._current_user != user:
             return False
-        seat.status = SeatStatus.FREE
-        seat.current_user = None
+        session._transition(seat, FREE, None)
         return True
 
 
@@ -166,22 +402,22 @@ class CancelReservation(BookingCommand):
 
     Место должно быть в статусе RESERVED и принадлежать указанному пользователю.
     После отмены становится FREE.
+
+    Команда не хранит состояния: используйте готовый экземпляр-синглтон
+    вместо создания нового на каждую операцию.
     """
 
     def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
-        seat = session.get_seat(seat_id)
-        if not seat or seat.status != SeatStatus.RESERVED or seat.current_user != user:
+        seat = session.seats.get(seat_id)
+        if not seat or seat._status != RESERVED or seat._current_user != user:
             return False
-        seat.status = SeatStatus.FREE
-        seat.current_user = None
+        session._transition(seat, FREE, None)
         return True
 
-    def undo(self, session: EventSession, seat_id: str, user: User) -> bool:
-        seat = session.get_seat(seat_id)
-        if not seat or seat.status != SeatStatus.FREE:
+    def undo_on_seat(self, session: EventSession, seat: Seat, user: User, memento: Any = None) -> bool:
+        if seat._status != FREE:
             return False
-        seat.status = SeatStatus.RESERVED
-        seat.current_user = user
+        session._transition(seat, RESERVED, user)
         return True
 
 
@@ -190,86 +426,262 @@ class PurchaseTicket(BookingCommand):
 
     Может применяться к FREE или RESERVED месту. После выполнения место переходит в SOLD.
     Привязывает место к пользователю (даже если оно было FREE).
+
+    Команда не хранит состояния: используйте готовый экземпляр-синглтон
+    вместо создания нового на каждую операцию.
     """
 
     def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
-        seat = session.get_seat(seat_id)
-        if not seat or (seat.status != SeatStatus.RESERVED and seat.status != SeatStatus.FREE):
+        seat = session.seats.get(seat_id)
+        if not seat or (seat._status != RESERVED and seat._status != FREE):
             return False
         # Можно покупать как забронированное, так и свободное место
-        seat.status = SeatStatus.SOLD
-        seat.current_user = user
+        session._transition(seat, SOLD, user)
         return True
 
-    def undo(self, session: EventSession, seat_id: str, user: User) -> bool:
-        seat = session.get_seat(seat_id)
-        if not seat or seat.status != SeatStatus.SOLD or seat.current_user != user:
+    def undo_on_seat(self, session: EventSession, seat: Seat, user: User, memento: Any = None) -> bool:
+        if seat._status != SOLD or seat._current_user != user:
             return False
         # Возвращаем в состояние "свободно" — можно усложнить логику, если нужно восстанавливать резерв
-        seat.status = SeatStatus.FREE
-        seat.current_user = None
+        session._transition(seat, FREE, None)
         return True
 
 
+RESERVE_SEAT: Final = ReserveSeat()
+CANCEL_RESERVATION: Final = CancelReservation()
+PURCHASE_TICKET: Final = PurchaseTicket()
+
+
+class SeatMemento(NamedTuple):
+    """Снимок места до переноса, по которому `ChangeSeat` откатывает операцию.
+
+    Attributes:
+        seat_id (str): ID места, с которого перенесена бронь или билет.
+        status (int): Статус этого места до переноса (RESERVED или SOLD).
+        user_id (str): ID пользователя, владевшего местом.
+    """
+    seat_id: str
+    status: int
+    user_id: str
+
+
 class ChangeSeat(BookingCommand):
     """Команда для переноса брони или билета с одного места на другое.
 
     Ищет текущее место пользователя (RESERVED или SOLD), освобождает его,
     и переносит статус на новое свободное место.
-    Сохраняет данные для корректного отката.
+    Данные для отката возвращаются из `execute_with_memento` и хранятся у вызывающей
+    стороны, поэтому через `BookingProcessor` один экземпляр безопасно использовать
+    из нескольких потоков. Прямой вызов `execute` дополнительно запоминает мементо
+    последней операции в экземпляре для `undo`; `reset` сбрасывает его.
     """
 
-    def __init__(self):
-        self._old_seat_id: Optional[str] = None
-        self._old_status: Optional[SeatStatus] = None
-        self._old_user: Optional[User] = None
+    def __init__(self) -> None:
+        # Пишется одним присваиванием, поэтому параллельный execute
+        # не оставит мементо в смешанном состоянии.
+        self._memento: Optional[SeatMemento] = None
+
+    def reset(self) -> None:
+        """Сбрасывает сохранённые для отката данные, чтобы переиспользовать команду."""
+        self._memento = None
 
     def execute(self, session: EventSession, new_seat_id: str, user: User) -> bool:
+        success, memento = self.execute_with_memento(session, new_seat_id, user)
+        if success:
+            self._memento = memento
+        return success
+
+    def execute_with_memento(
+        self, session: EventSession, new_seat_id: str, user: User
+    ) -> Tuple[bool, Optional[SeatMemento]]:
         # Найдём старое место пользователя
-        old_seat = None
-        for seat in session.seats.values():
-            if seat.current_user == user and seat.status in (SeatStatus.RESERVED, SeatStatus.SOLD):
-                old_seat = seat
-                break
-        if not old_seat:
+        seats = session.seats
+        seat_ids = session.seats_by_user.get(user.user_id, ())
+        candidates = [
+            seats[sid] for sid in seat_ids
+            if seats[sid]._current_user is user and seats[sid]._status in (RESERVED, SOLD)
+        ]
+        if not candidates:
+            return False, None
+        if len(candidates) == 1:
+            old_seat = candidates[0]
+        else:
+            # Индекс хранит места в порядке брони, а переносится первое по порядку зала
+            owned = set(candidates)
+            old_seat = next(seat for seat in seats.values() if seat in owned)
+
+        new_seat = seats.get(new_seat_id)
+        if not new_seat or new_seat._status != FREE:
+            return False, None
+
+        # Сохраняем данные для отмены
+        memento = SeatMemento(old_seat.seat_id, old_seat._status, user.user_id)
+
+        # Новое место свободно, поэтому обмен состояниями и есть перенос
+        session.swap_state(old_seat, new_seat)
+        return True, memento
+
+    def undo_on_seat(
+        self, session: EventSession, new_seat: Seat, user: User, memento: Optional[SeatMemento] = None
+    ) -> bool:
+        if memento is None:
+            memento = self._memento
+        if memento is None:
             return False
 
-        new_seat = session.get_seat(new_seat_id)
-        if not new_seat or new_seat.status != SeatStatus.FREE:
+        # Место из мементо обязано существовать: KeyError означает ошибку в программе
+        old_seat = session.seats[memento.seat_id]
+        new_user = new_seat._current_user
+        if (
+            old_seat._status != FREE
+            or new_seat._status != memento.status
+            or new_user is None
+            or new_user.user_id != memento.user_id
+        ):
             return False
 
-        # Сохраняем данные для отмены
-        self._old_seat_id = old_seat.seat_id
-        self._old_status = old_seat.status
-        self._old_user = user
+        # Отмена — обратный обмен тех же мест
+        session.swap_state(new_seat, old_seat)
+        return True
 
-        # Меняем
-        old_seat.status = SeatStatus.FREE
-        old_seat.current_user = None
 
-        new_seat.status = self._old_status
-        new_seat.current_user = user
-        return True
+class _SeqStep(NamedTuple):
+    """Выполненный шаг `SeqCommand`: подкоманда, её мементо и состояние места перед ней."""
+    command: BookingCommand
+    memento: Any
+    status: int
+    user: Optional[User]
+
+
+class SeqCommand(BookingCommand):
+    """Составная команда: несколько команд над одним местом как одна операция.
+
+    Подкоманды выполняются по порядку; если какая-то не удалась, уже выполненные
+    откатываются; если и откат не удался, выбрасывается RuntimeError. Отмена идёт
+    в обратном порядке, а в историю `BookingProcessor` попадает одна запись на всю
+    последовательность.
+    """
 
-    def undo(self, session: EventSession, new_seat_id: str, user: User) -> bool:
-        if self._old_seat_id is None:
+    def __init__(self, commands: Iterable[BookingCommand]) -> None:
+        self.commands: Tuple[BookingCommand, ...] = tuple(commands)
+        # Мементо последнего прямого вызова execute, как у ChangeSeat.
+        self._memento: Optional[Tuple[_SeqStep, ...]] = None
+
+    def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
+        success, memento = self.execute_with_memento(session, seat_id, user)
+        if success:
+            self._memento = memento
+        return success
+
+    def execute_with_memento(
+        self, session: EventSession, seat_id: str, user: User
+    ) -> Tuple[bool, Optional[Tuple[_SeqStep, ...]]]:
+        seat = session.seats.get(seat_id)
+        if not seat:
+            return False, None
+
+        done: List[_SeqStep] = []
+        for command in self.commands:
+            status, owner = seat._status, seat._current_user
+            success, memento = command.execute_with_memento(session, seat_id, user)
+            if not success:
+                # Откат только что выполненных шагов должен пройти; иначе место осталось
+                # в промежуточном состоянии, и вернуть False вызывающей стороне нельзя.
+                if not self.undo_on_seat(session, seat, user, tuple(done)):
+                    raise RuntimeError(f"SeqCommand: не удалось откатить шаги для места {seat_id}")
+                return False, None
+            done.append(_SeqStep(command, memento, status, owner))
+        return True, tuple(done)
+
+    def undo_on_seat(
+        self, session: EventSession, seat: Seat, user: User, memento: Optional[Tuple[_SeqStep, ...]] = None
+    ) -> bool:
+        steps = memento if memento is not None else self._memento
+        if steps is None:
             return False
+        for i in range(len(steps) - 1, -1, -1):
+            step: _SeqStep = steps[i]
+            if not step.command.undo_on_seat(session, seat, user, step.memento):
+                return False
+            # Отмена подкоманды может не вернуть место точно в прежнее состояние
+            # (возврат билета освобождает место, даже если до покупки оно было забронировано),
+            # поэтому восстанавливаем состояние, записанное перед шагом.
+            if seat._status != step.status or seat._current_user is not step.user:
+                session._transition(seat, step.status, step.user)
+        return True
+
+
+class _PurchaseReservedSeat(BookingCommand):
+    """Покупка места, которое пользователь уже забронировал; отмена возвращает бронь.
+
+    Служебная команда `BookingProcessor.reserve_and_purchase`: в отличие от PurchaseTicket,
+    отмена которой освобождает место, здесь бронь, сделанная до покупки, сохраняется.
+    """
 
-        old_seat = session.get_seat(self._old_seat_id)
-        new_seat = session.get_seat(new_seat_id)
+    def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
+        seat = session.seats.get(seat_id)
+        if not seat or seat._status != RESERVED or seat._current_user != user:
+            return False
+        session._transition(seat, SOLD, user)
+        return True
 
-        if not old_seat or not new_seat:
+    def undo_on_seat(self, session: EventSession, seat: Seat, user: User, memento: Any = None) -> bool:
+        if seat._status != SOLD or seat._current_user != user:
             return False
+        session._transition(seat, RESERVED, user)
+        return True
+
+
+class _BatchReservation(BookingCommand):
+    """Групповая бронь «всё или ничего» для `BookingProcessor.reserve_batch`.
+
+    Мементо — кортеж забронированных мест; `execute` бронирует группу из одного места.
+    """
 
-        # Отмена
-        new_seat.status = SeatStatus.FREE
-        new_seat.current_user = None
+    def execute(self, session: EventSession, seat_id: str, user: User) -> bool:
+        return self.reserve(session, (seat_id,), user) is not None
+
+    def execute_with_memento(
+        self, session: EventSession, seat_id: str, user: User
+    ) -> Tuple[bool, Optional[Tuple[Seat, ...]]]:
+        seats = self.reserve(session, (seat_id,), user)
+        return seats is not None, seats
+
+    def reserve(self, session: EventSession, seat_ids: Iterable[str], user: User) -> Optional[Tuple[Seat, ...]]:
+        """Бронирует все места группы, если все они найдены и свободны.
 
-        old_seat.status = self._old_status
-        old_seat.current_user = self._old_user
+        Returns:
+            Забронированные места в порядке ID (повторы отброшены) или None, если ничего не изменено.
+        """
+        session_seats = session.seats
+        try:
+            seats = tuple([session_seats[seat_id] for seat_id in dict.fromkeys(seat_ids)])
+        except KeyError:
+            return None
+        if not seats or any(seat._status != FREE for seat in seats):
+            return None
+
+        for seat in seats:
+            session._transition(seat, RESERVED, user)
+        return seats
+
+    def undo_on_seat(
+        self, session: EventSession, seat: Seat, user: User, memento: Optional[Tuple[Seat, ...]] = None
+    ) -> bool:
+        """Снимает бронь со всех мест группы или ни с одного."""
+        if memento is None:
+            return False
+        if any(batch_seat._status != RESERVED or batch_seat._current_user != user for batch_seat in memento):
+            return False
+        for batch_seat in reversed(memento):
+            session._transition(batch_seat, FREE, None)
         return True
 
 
+_PURCHASE_RESERVED_SEAT: Final = _PurchaseReservedSeat()
+_BATCH_RESERVATION: Final = _BatchReservation()
+
+
 class BookingProcessor:
     """Центральный процессор для выполнения и отслеживания команд бронирования.
 
@@ -277,18 +689,81 @@ class BookingProcessor:
 
 
     Attributes:
-        _history (list): Стек выполненных команд в формате (command, session_id, seat_id, user).
+        _history (deque): Стек выполненных команд в формате (command, session, seat, user, memento);
+            при отмене вызывается `command.undo_on_seat`.
+            Ограничен `history_limit` записями: при переполнении самая старая запись
+            молча отбрасывается и её уже нельзя отменить.
     """
 
-    def __init__(self):
-        self._history = []  
+    def __init__(self, history_limit: int = 1024) -> None:
+        """Инициализирует процессор.
+
+        Args:
+            history_limit: Максимальное число команд, хранимых для отмены.
+        """
+        self._history: Deque[Tuple[BookingCommand, EventSession, Seat, User, Any]] = deque(maxlen=history_limit)
 
     def execute_command(self, command: BookingCommand, session: EventSession, seat_id: str, user: User) -> bool:
-        success = command.execute(session, seat_id, user)
+        seat = session.seats.get(seat_id)
+        if not seat:
+            return False
+        success, memento = command.execute_with_memento(session, seat_id, user)
         if success:
-            self._history.append((command, session.session_id, seat_id, user))
+            self._history.append((command, session, seat, user, memento))
         return success
 
+    def reserve_and_purchase(self, session: EventSession, seat_id: str, user: User) -> bool:
+        """Бронирует и сразу покупает место.
+
+        Частный случай последовательности ReserveSeat -> PurchaseTicket: место переводится
+        в SOLD одним переходом, без промежуточной проверки брони, и в историю добавляется
+        одна запись. Свободное место после отмены снова свободно; если место уже было
+        забронировано этим пользователем, бронирование пропускается, а отмена
+        возвращает бронь.
+
+        Args:
+            session: Сессия мероприятия.
+            seat_id: Идентификатор места.
+            user: Покупатель.
+
+        Returns:
+            True, если место было свободно или забронировано пользователем и продано;
+            False в противном случае.
+        """
+        seat = session.seats.get(seat_id)
+        if not seat:
+            return False
+        if seat._status == FREE:
+            command: BookingCommand = PURCHASE_TICKET
+        elif seat._status == RESERVED and seat._current_user == user:
+            command = _PURCHASE_RESERVED_SEAT
+        else:
+            return False
+        session._transition(seat, SOLD, user)
+        self._history.append((command, session, seat, user, None))
+        return True
+
+    def reserve_batch(self, session: EventSession, seat_ids: Iterable[str], user: User) -> bool:
+        """Бронирует группу мест для пользователя по принципу «всё или ничего».
+
+        Статусы всех мест проверяются до первого изменения;
+        если хотя бы одно место не найдено или не свободно, ничего не меняется.
+        В историю добавляется одна запись на всю группу, её отмена снимает все брони.
+
+        Args:
+            session: Сессия мероприятия.
+            seat_ids: Идентификаторы мест группы (повторы игнорируются).
+            user: Пользователь, на которого оформляется бронь.
+
+        Returns:
+            True, если все места были свободны и забронированы; False в противном случае.
+        """
+        seats = _BATCH_RESERVATION.reserve(session, seat_ids, user)
+        if seats is None:
+            return False
+        self._history.append((_BATCH_RESERVATION, session, seats[0], user, seats))
+        return True
+
     def undo_last(self) -> bool:
         """Отменяет последнюю выполненную команду.
 
@@ -297,7 +772,6 @@ class BookingProcessor:
         """
         if not self._history:
             return False
-        command, session_id, seat_id, user = self._history.pop()
-        success = command.undo(None, seat_id, user)
-        return success
+        command, session, seat, user, memento = self._history.pop()
+        return command.undo_on_seat(session, seat, user, memento)
 
@@ -1,4 +1,4 @@
-from Booking import ChangeSeat, EventSession, PurchaseTicket, ReserveSeat, Seat, User
+from Booking import PURCHASE_TICKET, RESERVE_SEAT, ChangeSeat, EventSession, Seat, User
 
 if __name__ == "__main__":
     # Инициализация
@@ -12,14 +12,14 @@ if __name__ == "__main__":
 
     # --- Этап 1: Бронирование ---
     print("[1] Бронирование места A1")
-    reserve_cmd = ReserveSeat()
+    reserve_cmd = RESERVE_SEAT
     success = reserve_cmd.execute(session, "A1", user1)
     print(f"Успешно: {success}")
     print(f"Состояние A1: {session.get_seat('A1')}\n")
 
     # --- Этап 2: Покупка билета ---
     print("[2] Покупка билета на A1")
-    purchase_cmd = PurchaseTicket()
+    purchase_cmd = PURCHASE_TICKET
     success = purchase_cmd.execute(session, "A1", user1)
     print(f"Успешно: {success}")
     print(f"Состояние A1: {session.get_seat('A1')}\n")